@@ -14,10 +14,13 @@
 
 """Shared helper functions for connecting BigQuery and pandas."""
 
+import collections
 import concurrent.futures
 import functools
 import logging
+import os
 import queue
+import threading
 import warnings
 
 from packaging import version
@@ -37,9 +40,18 @@ try:
     from google.cloud.bigquery_storage import ArrowSerializationOptions
 except ImportError:
     _ARROW_COMPRESSION_SUPPORT = False
+    _PREFERRED_ARROW_CODEC = None
 else:
     # Having BQ Storage available implies that pyarrow >=1.0.0 is available, too.
     _ARROW_COMPRESSION_SUPPORT = True
+    # Prefer ZSTD if the installed BQ Storage library supports it. It trades a
+    # small CPU cost for a substantially better compression ratio than
+    # LZ4_FRAME, which pays off as downloads are usually network-bound.
+    _PREFERRED_ARROW_CODEC = getattr(
+        ArrowSerializationOptions.CompressionCodec,
+        "ZSTD",
+        ArrowSerializationOptions.CompressionCodec.LZ4_FRAME,
+    )
 
 from google.cloud.bigquery import schema
 
@@ -55,6 +67,27 @@ _PROGRESS_INTERVAL = 0.2  # Maximum time between download status checks, in seco
 
 _MAX_QUEUE_SIZE_DEFAULT = object()  # max queue size sentinel for BQ Storage downloads
 
+# Maximum number of cached BigQuery to Arrow conversions. The keys contain
+# user column names, so the caches must be bounded in long-running processes.
+_ARROW_TYPE_CACHE_SIZE = 1024
+
+# Environment variable to override the Arrow compression codec of BQ Storage
+# downloads, e.g. BQ_ARROW_CODEC=LZ4_FRAME.
+_ARROW_CODEC_ENV_VAR = "BQ_ARROW_CODEC"
+
+# Default bounds of the memory held by the frames of a BQ Storage download
+# that were not consumed yet, in bytes. Overridable with an environment
+# variable, e.g. BQ_DOWNLOAD_MEM_BUDGET=268435456.
+_MEMORY_BUDGET_MIN = 64 * 1024 * 1024
+_MEMORY_BUDGET_PER_STREAM = 8 * 1024 * 1024
+_MEMORY_BUDGET_ENV_VAR = "BQ_DOWNLOAD_MEM_BUDGET"
+
+# The Arrow conversion details of a BigQuery column, computed once per schema
+# field so that hot loops do not have to normalize the type and mode strings.
+_FieldDesc = collections.namedtuple(
+    "_FieldDesc", ["name", "is_repeated", "is_struct", "arrow_type", "arrow_field"]
+)
+
 _PANDAS_DTYPE_TO_BQ = {
     "bool": "BOOLEAN",
     "datetime64[ns, UTC]": "TIMESTAMP",
@@ -83,6 +116,98 @@ class _DownloadState(object):
         self.done = False
 
 
+def _frame_nbytes(frame):
+    """Return the (shallow) memory size of a downloaded frame, in bytes."""
+    if pandas is not None and isinstance(frame, pandas.DataFrame):
+        return int(frame.memory_usage(index=False, deep=False).sum())
+    return getattr(frame, "nbytes", 0)
+
+
+class _ByteBudgetQueue(queue.Queue):
+    """Queue of frame futures, bounded by the total size of the frames.
+
+    The items are futures of the frames that are still being decoded. The
+    size of a frame is added to the budget when its future completes, and it
+    is released once the frame has been taken from the queue. Producers block
+    on :meth:`put` while the budget is exceeded, or while ``max_pending``
+    frames are still being decoded.
+
+    Args:
+        max_bytes (int): The memory budget for the frames, in bytes.
+        max_pending (int): The maximum number of frames being decoded.
+    """
+
+    def __init__(self, max_bytes, max_pending):
+        # The number of items is only bounded by the budget.
+        super(_ByteBudgetQueue, self).__init__(maxsize=0)
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending
+        self._budget = threading.Condition()
+        self._used_bytes = 0
+        self._pending = 0
+        self._frame_sizes = {}
+        self._consumed = set()
+        self._closed = False
+
+    def _has_room(self):
+        return self._closed or (
+            self._used_bytes < self.max_bytes and self._pending < self.max_pending
+        )
+
+    def put(self, item, block=True, timeout=None):
+        with self._budget:
+            if not block:
+                if not self._has_room():
+                    raise queue.Full
+            elif timeout is None:
+                self._budget.wait_for(self._has_room)
+            elif not self._budget.wait_for(self._has_room, timeout=timeout):
+                raise queue.Full
+            self._pending += 1
+
+        # The callbacks of a finished future may still be running when the
+        # item is taken from the queue, so _on_frame_consumed() can be called
+        # before _on_frame_decoded(). Both handle either order.
+        item.add_done_callback(self._on_frame_decoded)
+        super(_ByteBudgetQueue, self).put(item, block=block, timeout=timeout)
+
+    def get(self, block=True, timeout=None):
+        item = super(_ByteBudgetQueue, self).get(block=block, timeout=timeout)
+        item.add_done_callback(self._on_frame_consumed)
+        return item
+
+    def close(self):
+        """Stop blocking the producers, e.g. when the download is cancelled."""
+        with self._budget:
+            self._closed = True
+            self._budget.notify_all()
+
+    def _on_frame_decoded(self, future):
+        if future.cancelled() or future.exception() is not None:
+            nbytes = 0
+        else:
+            nbytes = _frame_nbytes(future.result())
+
+        with self._budget:
+            self._pending -= 1
+            if future in self._consumed:
+                # Already taken from the queue, don't count its size.
+                self._consumed.discard(future)
+            else:
+                self._frame_sizes[future] = nbytes
+                self._used_bytes += nbytes
+            self._budget.notify_all()
+
+    def _on_frame_consumed(self, future):
+        with self._budget:
+            if future in self._frame_sizes:
+                self._used_bytes -= self._frame_sizes.pop(future)
+            else:
+                # Not counted yet, let _on_frame_decoded() know to skip it.
+                self._consumed.add(future)
+            self._budget.notify_all()
+
+
 def pyarrow_datetime():
     return pyarrow.timestamp("us", tz=None)
 
@@ -146,6 +271,14 @@ if pyarrow:
         # The exact scale and precision don't matter, see below.
         pyarrow.decimal128(38, scale=9).id: "NUMERIC",
     }
+    # Pandas dtypes with exactly the same values as the Arrow type. Converting
+    # such columns cannot overflow or lose precision, so the safety checks of
+    # the conversion can be skipped.
+    _ARROW_SCALAR_IDS_TO_EXACT_PANDAS_DTYPES = {
+        pyarrow.bool_().id: "bool",
+        pyarrow.int64().id: "int64",
+        pyarrow.float64().id: "float64",
+    }
 
     if version.parse(pyarrow.__version__) >= version.parse("3.0.0"):
         BQ_TO_ARROW_SCALARS["BIGNUMERIC"] = pyarrow_bignumeric
@@ -156,23 +289,97 @@ if pyarrow:
     else:
         _BIGNUMERIC_SUPPORT = False
 
+    # All the scalar types are parameterless (or always use the same
+    # parameters), so the Arrow type instances can be created once and shared.
+    _BQ_TO_ARROW_SCALAR_TYPES = {
+        bq_type: data_type_constructor()
+        for bq_type, data_type_constructor in BQ_TO_ARROW_SCALARS.items()
+    }
+
 else:  # pragma: NO COVER
     BQ_TO_ARROW_SCALARS = {}  # pragma: NO COVER
+    _BQ_TO_ARROW_SCALAR_TYPES = {}  # pragma: NO COVER
     ARROW_SCALAR_IDS_TO_BQ = {}  # pragma: NO_COVER
+    _ARROW_SCALAR_IDS_TO_EXACT_PANDAS_DTYPES = {}  # pragma: NO COVER
     _BIGNUMERIC_SUPPORT = False  # pragma: NO COVER
 
 
-def bq_to_arrow_struct_data_type(field):
-    arrow_fields = []
-    for subfield in field.fields:
-        arrow_subfield = bq_to_arrow_field(subfield)
-        if arrow_subfield:
+def _bq_to_arrow_type_key(field):
+    """Return a hashable key describing the Arrow type of a BigQuery column.
+
+    Only the properties relevant to the Arrow type conversion are included,
+    so that equivalent fields share the same cached conversion result. The
+    key is a ``(name, type_key)`` pair, where ``type_key`` leaves out the
+    column name, which does not affect the Arrow data type.
+    """
+    field_type_upper = field.field_type.upper() if field.field_type else ""
+    mode_upper = field.mode.upper() if field.mode else ""
+    subfield_keys = tuple(_bq_to_arrow_type_key(subfield) for subfield in field.fields)
+    return (field.name, (field_type_upper, mode_upper, subfield_keys))
+
+
+@functools.lru_cache(maxsize=_ARROW_TYPE_CACHE_SIZE)
+def _bq_to_arrow_data_type_cached(type_key):
+    field_type_upper, mode_upper, subfield_keys = type_key
+
+    if mode_upper == "REPEATED":
+        inner_type = _bq_to_arrow_data_type_cached(
+            (field_type_upper, "NULLABLE", subfield_keys)
+        )
+        if inner_type:
+            return pyarrow.list_(inner_type)
+        return None
+
+    if field_type_upper in schema._STRUCT_TYPES:
+        arrow_fields = []
+        for subfield_key in subfield_keys:
+            arrow_subfield = _bq_to_arrow_field_cached(subfield_key)
+            if arrow_subfield is None:
+                # Could not determine a subfield type. Fallback to type
+                # inference.
+                return None
             arrow_fields.append(arrow_subfield)
-        else:
-            # Could not determine a subfield type. Fallback to type
-            # inference.
-            return None
-    return pyarrow.struct(arrow_fields)
+        return pyarrow.struct(arrow_fields)
+
+    return _BQ_TO_ARROW_SCALAR_TYPES.get(field_type_upper)
+
+
+@functools.lru_cache(maxsize=_ARROW_TYPE_CACHE_SIZE)
+def _bq_to_arrow_field_cached(key):
+    name, type_key = key
+    arrow_type = _bq_to_arrow_data_type_cached(type_key)
+    if arrow_type:
+        _, mode_upper, _ = type_key
+        return pyarrow.field(name, arrow_type, nullable=mode_upper == "NULLABLE")
+    return None
+
+
+@functools.lru_cache(maxsize=_ARROW_TYPE_CACHE_SIZE)
+def _bq_field_desc_cached(key):
+    name, type_key = key
+    field_type_upper, mode_upper, _ = type_key
+    return _FieldDesc(
+        name=name,
+        is_repeated=mode_upper == "REPEATED",
+        is_struct=field_type_upper in schema._STRUCT_TYPES,
+        arrow_type=_bq_to_arrow_data_type_cached(type_key),
+        arrow_field=_bq_to_arrow_field_cached(key),
+    )
+
+
+def _warn_unknown_subfields(field):
+    """Warn about the first subfield of a STRUCT without a known Arrow type.
+
+    The conversion results are cached, so the warnings are issued here rather
+    than during the conversion itself.
+    """
+    field_type_upper = field.field_type.upper() if field.field_type else ""
+    if field_type_upper not in schema._STRUCT_TYPES:
+        return
+
+    for subfield in field.fields:
+        if bq_to_arrow_field(subfield) is None:
+            return
 
 
 def bq_to_arrow_data_type(field):
@@ -181,22 +388,35 @@ def bq_to_arrow_data_type(field):
     Returns:
         None: if default Arrow type inspection should be used.
     """
-    if field.mode is not None and field.mode.upper() == "REPEATED":
-        inner_type = bq_to_arrow_data_type(
-            schema.SchemaField(field.name, field.field_type, fields=field.fields)
-        )
-        if inner_type:
-            return pyarrow.list_(inner_type)
-        return None
+    _, type_key = _bq_to_arrow_type_key(field)
+    arrow_type = _bq_to_arrow_data_type_cached(type_key)
+    if arrow_type is None:
+        _warn_unknown_subfields(field)
+    return arrow_type
 
-    field_type_upper = field.field_type.upper() if field.field_type else ""
-    if field_type_upper in schema._STRUCT_TYPES:
-        return bq_to_arrow_struct_data_type(field)
 
-    data_type_constructor = BQ_TO_ARROW_SCALARS.get(field_type_upper)
-    if data_type_constructor is None:
-        return None
-    return data_type_constructor()
+def _prepare_field(bq_field):
+    """Return the Arrow conversion details of a given BigQuery column.
+
+    Returns:
+        _FieldDesc:
+            The conversion details. The Arrow type and field are ``None`` if
+            the Arrow type cannot be determined.
+    """
+    field_desc = _bq_field_desc_cached(_bq_to_arrow_type_key(bq_field))
+    if field_desc.arrow_field is None:
+        _warn_unknown_subfields(bq_field)
+        warnings.warn("Unable to determine type for field '{}'.".format(bq_field.name))
+    return field_desc
+
+
+def _prepare_schema(bq_schema):
+    """Return the Arrow conversion details of each field in a BigQuery schema.
+
+    Returns:
+        List[_FieldDesc]
+    """
+    return [_prepare_field(bq_field) for bq_field in bq_schema]
 
 
 def bq_to_arrow_field(bq_field):
@@ -205,13 +425,7 @@ def bq_to_arrow_field(bq_field):
     Returns:
         None: if the Arrow type cannot be determined.
     """
-    arrow_type = bq_to_arrow_data_type(bq_field)
-    if arrow_type:
-        is_nullable = bq_field.mode.upper() == "NULLABLE"
-        return pyarrow.field(bq_field.name, arrow_type, nullable=is_nullable)
-
-    warnings.warn("Unable to determine type for field '{}'.".format(bq_field.name))
-    return None
+    return _prepare_field(bq_field).arrow_field
 
 
 def bq_to_arrow_schema(bq_schema):
@@ -231,14 +445,24 @@ def bq_to_arrow_schema(bq_schema):
 
 
 def bq_to_arrow_array(series, bq_field):
-    arrow_type = bq_to_arrow_data_type(bq_field)
+    field_desc = _bq_field_desc_cached(_bq_to_arrow_type_key(bq_field))
+    if field_desc.arrow_type is None:
+        _warn_unknown_subfields(bq_field)
+    return _field_desc_to_arrow_array(series, field_desc)
 
-    field_type_upper = bq_field.field_type.upper() if bq_field.field_type else ""
 
-    if bq_field.mode.upper() == "REPEATED":
+def _field_desc_to_arrow_array(series, field_desc):
+    arrow_type = field_desc.arrow_type
+    if field_desc.is_repeated:
         return pyarrow.ListArray.from_pandas(series, type=arrow_type)
-    if field_type_upper in schema._STRUCT_TYPES:
+    if field_desc.is_struct:
         return pyarrow.StructArray.from_pandas(series, type=arrow_type)
+    if (
+        arrow_type is not None
+        and _ARROW_SCALAR_IDS_TO_EXACT_PANDAS_DTYPES.get(arrow_type.id)
+        == series.dtype.name
+    ):
+        return pyarrow.Array.from_pandas(series, type=arrow_type, safe=False)
     return pyarrow.Array.from_pandas(series, type=arrow_type)
 
 
@@ -270,7 +494,9 @@ def list_columns_and_indexes(dataframe):
             corresponding dtypes. If an index is missing a name or has the
             same name as a column, the index is omitted.
     """
-    column_names = frozenset(dataframe.columns)
+    # The pandas Index supports hashed membership tests itself, no need to
+    # copy the column names to a set first.
+    column_names = dataframe.columns
     columns_and_indexes = []
     if isinstance(dataframe.index, pandas.MultiIndex):
         for name in dataframe.index.names:
@@ -376,13 +602,26 @@ def augment_schema(dataframe, current_bq_schema):
     augmented_schema = []
     unknown_type_fields = []
 
+    # Let pyarrow infer the types of all the unknown columns in a single pass.
+    unknown_names = [
+        field.name for field in current_bq_schema if field.field_type is None
+    ]
+    detected_types = {}
+    if unknown_names:
+        arrow_table = pyarrow.Table.from_pandas(
+            dataframe[unknown_names], preserve_index=False
+        )
+        detected_types = {
+            name: ARROW_SCALAR_IDS_TO_BQ.get(arrow_type.id)
+            for name, arrow_type in zip(unknown_names, arrow_table.schema.types)
+        }
+
     for field in current_bq_schema:
         if field.field_type is not None:
             augmented_schema.append(field)
             continue
 
-        arrow_table = pyarrow.array(dataframe[field.name])
-        detected_type = ARROW_SCALAR_IDS_TO_BQ.get(arrow_table.type.id)
+        detected_type = detected_types[field.name]
 
         if detected_type is None:
             unknown_type_fields.append(field)
@@ -450,15 +689,43 @@ def dataframe_to_arrow(dataframe, bq_schema):
             u"bq_schema is missing fields from dataframe: {}".format(missing_fields)
         )
 
+    field_descs = _prepare_schema(bq_schema)
+    arrow_fields = [field_desc.arrow_field for field_desc in field_descs]
+
+    # If all the types are known scalars and all fields are columns (rather
+    # than indexes), let pyarrow convert the whole DataFrame in a single pass.
+    # Nested types still go through the per-column conversion below.
+    if all(field is not None for field in arrow_fields) and all(
+        field_desc.name in column_names
+        and not (field_desc.is_repeated or field_desc.is_struct)
+        for field_desc in field_descs
+    ):
+        # Table.from_pandas() rejects nulls in non-nullable fields, unlike
+        # the per-column conversion. Convert with nullable fields, then apply
+        # the actual schema the same way the per-column conversion does. This
+        # also drops the pandas metadata.
+        arrow_table = pyarrow.Table.from_pandas(
+            dataframe,
+            schema=pyarrow.schema(
+                [field.with_nullable(True) for field in arrow_fields]
+            ),
+            preserve_index=False,
+        )
+        return pyarrow.Table.from_arrays(
+            arrow_table.columns, schema=pyarrow.schema(arrow_fields)
+        )
+
     arrow_arrays = []
     arrow_names = []
-    arrow_fields = []
-    for bq_field in bq_schema:
-        arrow_fields.append(bq_to_arrow_field(bq_field))
-        arrow_names.append(bq_field.name)
-        arrow_arrays.append(
-            bq_to_arrow_array(get_column_or_index(dataframe, bq_field.name), bq_field)
-        )
+    for field_desc in field_descs:
+        if field_desc.name in column_names:
+            # The Arrow conversion ignores the index, so the column can be
+            # used as is, without copying it to reset the index first.
+            series = dataframe[field_desc.name]
+        else:
+            series = get_column_or_index(dataframe, field_desc.name)
+        arrow_names.append(field_desc.name)
+        arrow_arrays.append(_field_desc_to_arrow_array(series, field_desc))
 
     if all((field is not None for field in arrow_fields)):
         return pyarrow.Table.from_arrays(
@@ -497,20 +764,19 @@ def dataframe_to_parquet(dataframe, bq_schema, filepath, parquet_compression="SN
     pyarrow.parquet.write_table(arrow_table, filepath, compression=parquet_compression)
 
 
-def _row_iterator_page_to_arrow(page, column_names, arrow_types):
+def _row_iterator_page_to_arrow(page, typed_columns, make_batch):
     # Iterate over the page to force the API request to get the page data.
     try:
         next(iter(page))
     except StopIteration:
         pass
 
-    arrays = []
-    for column_index, arrow_type in enumerate(arrow_types):
-        arrays.append(pyarrow.array(page._columns[column_index], type=arrow_type))
-
-    if isinstance(column_names, pyarrow.Schema):
-        return pyarrow.RecordBatch.from_arrays(arrays, schema=column_names)
-    return pyarrow.RecordBatch.from_arrays(arrays, names=column_names)
+    columns = page._columns
+    arrays = [
+        pyarrow.array(columns[column_index], type=arrow_type)
+        for column_index, arrow_type in typed_columns
+    ]
+    return make_batch(arrays)
 
 
 def download_arrow_row_iterator(pages, bq_schema):
@@ -529,11 +795,24 @@ def download_arrow_row_iterator(pages, bq_schema):
         The next page of records as a ``pyarrow`` record batch.
     """
     bq_schema = schema._to_schema_fields(bq_schema)
-    column_names = bq_to_arrow_schema(bq_schema) or [field.name for field in bq_schema]
-    arrow_types = [bq_to_arrow_data_type(field) for field in bq_schema]
+    field_descs = _prepare_schema(bq_schema)
+    typed_columns = list(enumerate(field_desc.arrow_type for field_desc in field_descs))
+    arrow_fields = [field_desc.arrow_field for field_desc in field_descs]
+
+    # Decide once how the record batches are built, rather than on every page.
+    # With a known schema, all the batches share the same schema object.
+    if all(field is not None for field in arrow_fields):
+        make_batch = functools.partial(
+            pyarrow.RecordBatch.from_arrays, schema=pyarrow.schema(arrow_fields)
+        )
+    else:
+        make_batch = functools.partial(
+            pyarrow.RecordBatch.from_arrays,
+            names=[field_desc.name for field_desc in field_descs],
+        )
 
     for page in pages:
-        yield _row_iterator_page_to_arrow(page, column_names, arrow_types)
+        yield _row_iterator_page_to_arrow(page, typed_columns, make_batch)
 
 
 def _row_iterator_page_to_dataframe(page, column_names, dtypes):
@@ -545,8 +824,15 @@ def _row_iterator_page_to_dataframe(page, column_names, dtypes):
 
     columns = {}
     for column_index, column_name in enumerate(column_names):
+        # The page columns are generators, so materialize them first.
+        values = list(page._columns[column_index])
         dtype = dtypes.get(column_name)
-        columns[column_name] = pandas.Series(page._columns[column_index], dtype=dtype)
+        # Only wrap the values in a Series if a dtype hint has to be applied.
+        # Otherwise the DataFrame constructor infers the same dtype from the
+        # plain list, without allocating an intermediate Series per column.
+        if dtype is not None:
+            values = pandas.Series(values, dtype=dtype)
+        columns[column_name] = values
 
     return pandas.DataFrame(columns, columns=column_names)
 
@@ -588,27 +874,65 @@ def _bqstorage_page_to_dataframe(column_names, dtypes, page):
 def _download_table_bqstorage_stream(
     download_state, bqstorage_client, session, stream, worker_queue, page_to_item
 ):
+    # Streams still waiting for a thread when the download is cancelled are
+    # run on shutdown. Don't open them only to discard the first page.
+    if download_state.done:
+        return
+
     rowstream = bqstorage_client.read_rows(stream.name).rows(session)
 
-    for page in rowstream.pages:
+    for page_index, page in enumerate(rowstream.pages):
         if download_state.done:
             return
         item = page_to_item(page)
         worker_queue.put(item)
+        if page_index == 0:
+            # The pages of a stream share a parser, which is not thread-safe
+            # until it has parsed the Arrow schema while decoding the first
+            # page. Wait for that before decoding the other pages.
+            concurrent.futures.wait([item])
 
 
-def _nowait(futures):
-    """Separate finished and unfinished threads, much like
-    :func:`concurrent.futures.wait`, but don't wait.
+def _get_arrow_compression_codec():
+    """Return the Arrow buffer compression codec for BQ Storage downloads.
+
+    Defaults to ZSTD if supported by the BQ Storage library, and LZ4_FRAME
+    otherwise. Set the ``BQ_ARROW_CODEC`` environment variable to a codec name
+    to override it.
     """
-    done = []
-    not_done = []
-    for future in futures:
-        if future.done():
-            done.append(future)
-        else:
-            not_done.append(future)
-    return done, not_done
+    codec_name = os.getenv(_ARROW_CODEC_ENV_VAR)
+    if not codec_name:
+        return _PREFERRED_ARROW_CODEC
+
+    try:
+        return ArrowSerializationOptions.CompressionCodec[codec_name.upper()]
+    except KeyError:
+        raise ValueError(
+            "Unknown Arrow compression codec '{}' set in {}.".format(
+                codec_name, _ARROW_CODEC_ENV_VAR
+            )
+        )
+
+
+def _get_download_memory_budget(total_streams):
+    """Return the memory budget of a BQ Storage download, in bytes.
+
+    Defaults to 8 MB per stream, but at least 64 MB. Set the
+    ``BQ_DOWNLOAD_MEM_BUDGET`` environment variable to a number of bytes to
+    override it.
+    """
+    budget = os.getenv(_MEMORY_BUDGET_ENV_VAR)
+    if not budget:
+        return max(_MEMORY_BUDGET_MIN, total_streams * _MEMORY_BUDGET_PER_STREAM)
+
+    try:
+        return int(budget)
+    except ValueError:
+        raise ValueError(
+            "Invalid memory budget '{}' set in {}, expected a number of bytes.".format(
+                budget, _MEMORY_BUDGET_ENV_VAR
+            )
+        )
 
 
 def _download_table_bqstorage(
@@ -619,6 +943,7 @@ def _download_table_bqstorage(
     selected_fields=None,
     page_to_item=None,
     max_queue_size=_MAX_QUEUE_SIZE_DEFAULT,
+    compression_codec=None,
 ):
     """Use (faster, but billable) BQ Storage API to construct DataFrame."""
 
@@ -643,8 +968,10 @@ def _download_table_bqstorage(
             requested_session.read_options.selected_fields.append(field.name)
 
     if _ARROW_COMPRESSION_SUPPORT:
+        if compression_codec is None:
+            compression_codec = _get_arrow_compression_codec()
         requested_session.read_options.arrow_serialization_options.buffer_compression = (
-            ArrowSerializationOptions.CompressionCodec.LZ4_FRAME
+            compression_codec
         )
 
     session = bqstorage_client.create_read_session(
@@ -675,20 +1002,40 @@ def _download_table_bqstorage(
     # fetched result pages too slowly, while at the same time new pages are rapidly being
     # fetched from the server, the queue can grow to the point where the process runs
     # out of memory.
+    #
+    # By default, the queue is bounded by the memory used by the frames rather
+    # than by their number, as the size of a page varies a lot with the width
+    # of the table.
     if max_queue_size is _MAX_QUEUE_SIZE_DEFAULT:
-        max_queue_size = total_streams
-    elif max_queue_size is None:
-        max_queue_size = 0  # unbounded
+        worker_queue = _ByteBudgetQueue(
+            _get_download_memory_budget(total_streams), max_pending=total_streams
+        )
+    else:
+        if max_queue_size is None:
+            max_queue_size = 0  # unbounded
+        worker_queue = queue.Queue(maxsize=max_queue_size)
+
+    # Decode the pages in a separate pool, so that the download threads can
+    # keep reading from the network while previous pages are being decoded.
+    # The download threads put the decoding futures on the queue in the order
+    # of the pages, and the main thread waits for their results.
+    decode_pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(os.cpu_count() or 1, total_streams)
+    )
+    page_to_future = functools.partial(decode_pool.submit, page_to_item)
 
-    worker_queue = queue.Queue(maxsize=max_queue_size)
+    # Downloading is mostly waiting on the network, so use more threads than
+    # CPUs, but not one per stream: the server may create hundreds of streams.
+    # Streams that don't get a thread right away are read once others finish.
+    download_workers = min(total_streams, max(4, (os.cpu_count() or 1) * 4))
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=total_streams) as pool:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=download_workers) as pool:
         try:
             # Manually submit jobs and wait for download to complete rather
             # than using pool.map because pool.map continues running in the
             # background even if there is an exception on the main thread.
             # See: https://github.com/googleapis/google-cloud-python/pull/7698
-            not_done = [
+            not_done = {
                 pool.submit(
                     _download_table_bqstorage_stream,
                     download_state,
@@ -696,10 +1043,10 @@ def _download_table_bqstorage(
                     session,
                     stream,
                     worker_queue,
-                    page_to_item,
+                    page_to_future,
                 )
                 for stream in session.streams
-            ]
+            }
 
             while not_done:
                 # Don't block on the worker threads. For performance reasons,
@@ -708,7 +1055,7 @@ def _download_table_bqstorage(
                 # has smaller gaps in time between calls to the queue's get
                 # method. For a detailed explaination, see:
                 # https://friendliness.dev/2019/06/18/python-nowait/
-                done, not_done = _nowait(not_done)
+                done, not_done = concurrent.futures.wait(not_done, timeout=0)
                 for future in done:
                     # Call result() on any finished threads to raise any
                     # exceptions encountered.
@@ -716,15 +1063,26 @@ def _download_table_bqstorage(
 
                 try:
                     frame = worker_queue.get(timeout=_PROGRESS_INTERVAL)
-                    yield frame
+                    yield frame.result()
                 except queue.Empty:  # pragma: NO COVER
                     continue
 
+                # Also yield the frames that are already waiting in the queue
+                # before checking on the worker threads again. The number of
+                # frames is bounded, so that finished (or failed) workers are
+                # still noticed while the queue is being refilled.
+                for _ in range(worker_queue.qsize()):
+                    try:
+                        frame = worker_queue.get_nowait()
+                    except queue.Empty:  # pragma: NO COVER
+                        break
+                    yield frame.result()
+
             # Return any remaining values after the workers finished.
             while True:  # pragma: NO COVER
                 try:
                     frame = worker_queue.get_nowait()
-                    yield frame
+                    yield frame.result()
                 except queue.Empty:  # pragma: NO COVER
                     break
         finally:
@@ -732,14 +1090,22 @@ def _download_table_bqstorage(
             # defined to be an atomic operation in the Python language
             # definition (enforced by the global interpreter lock).
             download_state.done = True
+            if isinstance(worker_queue, _ByteBudgetQueue):
+                worker_queue.close()
 
             # Shutdown all background threads, now that they should know to
             # exit early.
             pool.shutdown(wait=True)
+            decode_pool.shutdown(wait=True)
 
 
 def download_arrow_bqstorage(
-    project_id, table, bqstorage_client, preserve_order=False, selected_fields=None,
+    project_id,
+    table,
+    bqstorage_client,
+    preserve_order=False,
+    selected_fields=None,
+    compression_codec=None,
 ):
     return _download_table_bqstorage(
         project_id,
@@ -748,6 +1114,7 @@ def download_arrow_bqstorage(
         preserve_order=preserve_order,
         selected_fields=selected_fields,
         page_to_item=_bqstorage_page_to_arrow,
+        compression_codec=compression_codec,
     )
 
 
@@ -760,6 +1127,7 @@ def download_dataframe_bqstorage(
     preserve_order=False,
     selected_fields=None,
     max_queue_size=_MAX_QUEUE_SIZE_DEFAULT,
+    compression_codec=None,
 ):
     page_to_item = functools.partial(_bqstorage_page_to_dataframe, column_names, dtypes)
     return _download_table_bqstorage(
@@ -770,15 +1138,31 @@ def download_dataframe_bqstorage(
         selected_fields=selected_fields,
         page_to_item=page_to_item,
         max_queue_size=max_queue_size,
+        compression_codec=compression_codec,
     )
 
 
 def dataframe_to_json_generator(dataframe):
-    for row in dataframe.itertuples(index=False, name=None):
-        output = {}
-        for column, value in zip(dataframe.columns, row):
-            # Omit NaN values.
-            if value != value:
-                continue
-            output[column] = value
-        yield output
+    columns = dataframe.columns.tolist()
+    if not columns:
+        # Don't yield empty rows for the index entries.
+        return
+
+    # Convert the data column by column. Series.tolist() boxes values as
+    # Python scalars, the same way as iterating over the rows does.
+    column_values = []
+    column_is_valid = []
+    for column_index in range(len(columns)):
+        series = dataframe.iloc[:, column_index]
+        column_values.append(series.tolist())
+        # Omit NaN values. The mask is computed by a single vectorized pass
+        # over the column, and only kept if the column contains any NaNs.
+        is_valid = series.notna().values
+        column_is_valid.append(None if is_valid.all() else is_valid.tolist())
+
+    for row_index in range(len(dataframe)):
+        yield {
+            column: values[row_index]
+            for column, values, is_valid in zip(columns, column_values, column_is_valid)
+            if is_valid is None or is_valid[row_index]
+        }
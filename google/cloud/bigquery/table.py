@@ -1556,6 +1556,11 @@ class RowIterator(HTTPIterator):
                 This method only  exposes a subset of the capabilities of the
                 BigQuery Storage API.  For full access to all features
                 (projections, filters, snapshots) use the Storage API directly.
+
+                The downloaded Arrow buffers are compressed with ZSTD if the
+                installed BigQuery Storage library supports it, and LZ4_FRAME
+                otherwise. Set the ``BQ_ARROW_CODEC`` environment variable to a
+                codec name, such as ``LZ4_FRAME``, to override it.
             create_bqstorage_client (Optional[bool]):
                 If ``True`` (default), create a BigQuery Storage API client using
                 the default API settings. The BigQuery Storage API is a faster way
@@ -1641,6 +1646,11 @@ class RowIterator(HTTPIterator):
                 BigQuery Storage API. For full access to all features
                 (projections, filters, snapshots) use the Storage API directly.
 
+                The downloaded Arrow buffers are compressed with ZSTD if the
+                installed BigQuery Storage library supports it, and LZ4_FRAME
+                otherwise. Set the ``BQ_ARROW_CODEC`` environment variable to a
+                codec name, such as ``LZ4_FRAME``, to override it.
+
             dtypes (Optional[Map[str, Union[str, pandas.Series.dtype]]]):
                 A dictionary of column names pandas ``dtype``s. The provided
                 ``dtype`` is used when constructing the series for the column
@@ -1651,9 +1661,11 @@ class RowIterator(HTTPIterator):
                 streaming query results over the BigQuery Storage API. Ignored if
                 Storage API is not used.
 
-                By default, the max queue size is set to the number of BQ Storage streams
-                created by the server. If ``max_queue_size`` is :data:`None`, the queue
-                size is infinite.
+                By default, the queue is bounded by the memory used by the result
+                pages rather than by their number: 8 MB per BQ Storage stream created
+                by the server, but at least 64 MB. Set the ``BQ_DOWNLOAD_MEM_BUDGET``
+                environment variable to a number of bytes to override the default.
+                If ``max_queue_size`` is :data:`None`, the queue size is infinite.
 
                 ..versionadded:: 2.14.0
 
@@ -1718,6 +1730,11 @@ class RowIterator(HTTPIterator):
                 BigQuery Storage API. For full access to all features
                 (projections, filters, snapshots) use the Storage API directly.
 
+                The downloaded Arrow buffers are compressed with ZSTD if the
+                installed BigQuery Storage library supports it, and LZ4_FRAME
+                otherwise. Set the ``BQ_ARROW_CODEC`` environment variable to a
+                codec name, such as ``LZ4_FRAME``, to override it.
+
             dtypes (Optional[Map[str, Union[str, pandas.Series.dtype]]]):
                 A dictionary of column names pandas ``dtype``s. The provided
                 ``dtype`` is used when constructing the series for the column
@@ -42,16 +42,21 @@ from .helpers import _make_job_resource
 
 
 @pytest.fixture
-def table_read_options_kwarg():
+def table_read_options_kwarg(monkeypatch):
     # Create a BigQuery Storage table read options object with pyarrow compression
     # enabled if a recent-enough version of google-cloud-bigquery-storage dependency is
     # installed to support the compression.
     if not hasattr(bigquery_storage, "ArrowSerializationOptions"):
         return {}
 
+    from google.cloud.bigquery import _pandas_helpers
+
+    # Use the default codec, regardless of the environment.
+    monkeypatch.delenv(_pandas_helpers._ARROW_CODEC_ENV_VAR, raising=False)
+
     read_options = bigquery_storage.ReadSession.TableReadOptions(
         arrow_serialization_options=bigquery_storage.ArrowSerializationOptions(
-            buffer_compression=bigquery_storage.ArrowSerializationOptions.CompressionCodec.LZ4_FRAME
+            buffer_compression=_pandas_helpers._PREFERRED_ARROW_CODEC
         )
     )
     return {"read_options": read_options}
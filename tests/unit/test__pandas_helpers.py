@@ -13,11 +13,13 @@
 # limitations under the License.
 
 import collections
+import concurrent.futures
 import datetime
 import decimal
 import functools
 import operator
 import queue
+import time
 import warnings
 
 import mock
@@ -289,6 +291,19 @@ def test_bq_to_arrow_data_type(module_under_test, bq_type, bq_mode, is_correct_t
     assert is_correct_type(actual)
 
 
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_bq_to_arrow_data_type_shares_scalar_types(module_under_test):
+    timestamp_type = module_under_test.bq_to_arrow_data_type(
+        schema.SchemaField("field1", "TIMESTAMP")
+    )
+    other_timestamp_type = module_under_test.bq_to_arrow_data_type(
+        schema.SchemaField("field2", "TIMESTAMP", mode="REQUIRED")
+    )
+
+    assert timestamp_type is other_timestamp_type
+    assert is_timestamp(timestamp_type)
+
+
 @pytest.mark.parametrize("bq_type", ["RECORD", "record", "STRUCT", "struct"])
 @pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
 def test_bq_to_arrow_data_type_w_struct(module_under_test, bq_type):
@@ -412,6 +427,93 @@ def test_bq_to_arrow_data_type_w_struct_unknown_subfield(module_under_test):
     assert "field3" in str(warning)
 
 
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_bq_to_arrow_data_type_w_struct_unknown_subfield_warns_each_time(
+    module_under_test,
+):
+    fields = (
+        schema.SchemaField("field1", "STRING"),
+        schema.SchemaField("field2", "UNKNOWN_TYPE"),
+    )
+    field = schema.SchemaField("ignored_name", "RECORD", mode="NULLABLE", fields=fields)
+
+    for _ in range(2):
+        with warnings.catch_warnings(record=True) as warned:
+            warnings.simplefilter("always")
+            actual = module_under_test.bq_to_arrow_data_type(field)
+
+        assert actual is None
+        assert len(warned) == 1
+        assert "field2" in str(warned[0])
+
+
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_bq_to_arrow_field_reuses_cached_conversion(module_under_test):
+    fields = (
+        schema.SchemaField("field1", "TIMESTAMP"),
+        schema.SchemaField("field2", "NUMERIC", mode="REQUIRED"),
+    )
+    field = schema.SchemaField("struct_col", "RECORD", mode="REPEATED", fields=fields)
+    equivalent_field = schema.SchemaField(
+        "struct_col", "record", mode="repeated", fields=fields
+    )
+
+    actual = module_under_test.bq_to_arrow_field(field)
+
+    assert module_under_test.bq_to_arrow_field(equivalent_field) is actual
+    assert actual.name == "struct_col"
+    assert pyarrow.types.is_list(actual.type)
+    assert not actual.nullable
+
+
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_bq_to_arrow_data_type_shared_across_column_names(module_under_test):
+    fields = (schema.SchemaField("field1", "INTEGER"),)
+    field = schema.SchemaField("struct_col", "RECORD", fields=fields)
+    renamed_field = schema.SchemaField("other_col", "RECORD", fields=fields)
+
+    actual = module_under_test.bq_to_arrow_data_type(field)
+
+    assert module_under_test.bq_to_arrow_data_type(renamed_field) is actual
+    cache_info = module_under_test._bq_to_arrow_data_type_cached.cache_info()
+    assert cache_info.maxsize == module_under_test._ARROW_TYPE_CACHE_SIZE
+
+
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test__prepare_schema(module_under_test):
+    bq_schema = (
+        schema.SchemaField("int_col", "integer", mode="required"),
+        schema.SchemaField("str_array_col", "STRING", mode="REPEATED"),
+        schema.SchemaField(
+            "struct_col", "RECORD", fields=(schema.SchemaField("sub", "BOOL"),)
+        ),
+        schema.SchemaField("unknown_col", "UNKNOWN_TYPE"),
+    )
+
+    with warnings.catch_warnings(record=True) as warned:
+        warnings.simplefilter("always")
+        field_descs = module_under_test._prepare_schema(bq_schema)
+
+    assert [desc.name for desc in field_descs] == [
+        "int_col",
+        "str_array_col",
+        "struct_col",
+        "unknown_col",
+    ]
+    assert [desc.is_repeated for desc in field_descs] == [False, True, False, False]
+    assert [desc.is_struct for desc in field_descs] == [False, False, True, False]
+    assert field_descs[0].arrow_field == pyarrow.field(
+        "int_col", pyarrow.int64(), nullable=False
+    )
+    assert pyarrow.types.is_list(field_descs[1].arrow_type)
+    assert pyarrow.types.is_struct(field_descs[2].arrow_type)
+    assert field_descs[3].arrow_type is None
+    assert field_descs[3].arrow_field is None
+
+    assert len(warned) == 1
+    assert "unknown_col" in str(warned[0])
+
+
 @pytest.mark.parametrize(
     "bq_type,rows",
     [
@@ -587,6 +689,28 @@ def test_bq_to_arrow_array_w_special_floats(module_under_test):
     assert roundtrip[3] is None
 
 
+@pytest.mark.parametrize(
+    "bq_type,dtype,rows",
+    [
+        ("BOOL", "bool", [True, False, True]),
+        ("INT64", "int64", [-(2 ** 63), 0, 2 ** 63 - 1]),
+        ("FLOAT64", "float64", [-1.5, float("nan"), 3.25]),
+        # Dtypes not matching the Arrow type exactly still get converted.
+        ("INT64", "int32", [-1, 0, 1]),
+        ("FLOAT64", "float32", [-1.5, 0.0, 3.25]),
+    ],
+)
+@pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_bq_to_arrow_array_w_numpy_dtypes(module_under_test, bq_type, dtype, rows):
+    bq_field = schema.SchemaField("field_name", bq_type)
+    series = pandas.Series(rows, dtype=dtype)
+    arrow_array = module_under_test.bq_to_arrow_array(series, bq_field)
+    expected = [None if row != row else row for row in rows]
+    assert arrow_array.type == module_under_test.bq_to_arrow_data_type(bq_field)
+    assert arrow_array.to_pylist() == expected
+
+
 @pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
 def test_bq_to_arrow_schema_w_unknown_type(module_under_test):
     fields = (
@@ -943,6 +1067,26 @@ def test_dataframe_to_arrow_with_required_fields(module_under_test):
         assert not arrow_field.nullable
 
 
+@pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_dataframe_to_arrow_with_required_fields_w_nulls(module_under_test):
+    bq_schema = (
+        schema.SchemaField("float_col", "FLOAT", mode="REQUIRED"),
+        schema.SchemaField("str_col", "STRING", mode="REQUIRED"),
+    )
+    dataframe = pandas.DataFrame({"float_col": [1.0, None], "str_col": ["a", None]})
+
+    arrow_table = module_under_test.dataframe_to_arrow(dataframe, bq_schema)
+
+    assert not arrow_table.schema.field("float_col").nullable
+    assert not arrow_table.schema.field("str_col").nullable
+    assert arrow_table.schema.metadata is None
+    assert arrow_table.to_pydict() == {
+        "float_col": [1.0, None],
+        "str_col": ["a", None],
+    }
+
+
 @pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
 @pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
 def test_dataframe_to_arrow_with_unknown_type(module_under_test):
@@ -998,6 +1142,51 @@ def test_dataframe_to_arrow_dict_sequence_schema(module_under_test):
     assert list(arrow_schema) == expected_fields
 
 
+@pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_dataframe_to_arrow_with_scalar_columns_only(module_under_test):
+    bq_schema = (
+        schema.SchemaField("int_col", "INTEGER"),
+        schema.SchemaField("float_col", "FLOAT"),
+        schema.SchemaField("str_col", "STRING"),
+    )
+    dataframe = pandas.DataFrame(
+        {
+            "int_col": [1, 2, 3],
+            "float_col": [0.5, float("nan"), 1.5],
+            "str_col": ["a", None, "c"],
+        }
+    )
+
+    arrow_table = module_under_test.dataframe_to_arrow(dataframe, bq_schema)
+
+    assert arrow_table.schema.metadata is None
+    assert arrow_table.schema.names == ["int_col", "float_col", "str_col"]
+    assert arrow_table.to_pydict() == {
+        "int_col": [1, 2, 3],
+        "float_col": [0.5, None, 1.5],
+        "str_col": ["a", None, "c"],
+    }
+
+
+@pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_dataframe_to_arrow_with_repeated_column(module_under_test):
+    bq_schema = (
+        schema.SchemaField("int_col", "INTEGER"),
+        schema.SchemaField("str_array_col", "STRING", mode="REPEATED"),
+    )
+    dataframe = pandas.DataFrame({"int_col": [1, 2], "str_array_col": [["a", "b"], []]})
+
+    arrow_table = module_under_test.dataframe_to_arrow(dataframe, bq_schema)
+
+    assert pyarrow.types.is_list(arrow_table.schema.field("str_array_col").type)
+    assert arrow_table.to_pydict() == {
+        "int_col": [1, 2],
+        "str_array_col": [["a", "b"], []],
+    }
+
+
 @pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
 def test_dataframe_to_parquet_without_pyarrow(module_under_test, monkeypatch):
     monkeypatch.setattr(module_under_test, "pyarrow", None)
@@ -1275,7 +1464,7 @@ def test_dataframe_to_parquet_dict_sequence_schema(module_under_test):
     "stream_count,maxsize_kwarg,expected_call_count,expected_maxsize",
     [
         (3, {"max_queue_size": 2}, 3, 2),  # custom queue size
-        (4, {}, 4, 4),  # default queue size
+        (4, {}, 4, 0),  # default queue, bounded by memory instead
         (7, {"max_queue_size": None}, 7, 0),  # infinite queue size
     ],
 )
@@ -1310,7 +1499,7 @@ def test__download_table_bqstorage(
         nonlocal queue_used
         queue_used = worker_queue
         try:
-            worker_queue.put_nowait("result_page")
+            worker_queue.put_nowait(page_to_item("result_page"))
         except queue.Full:  # pragma: NO COVER
             pass
 
@@ -1320,15 +1509,355 @@ def test__download_table_bqstorage(
         module_under_test, "_download_table_bqstorage_stream", new=download_stream
     ):
         result_gen = module_under_test._download_table_bqstorage(
-            "some-project", table_ref, bqstorage_client, **maxsize_kwarg
+            "some-project",
+            table_ref,
+            bqstorage_client,
+            page_to_item=lambda page: page.upper(),
+            **maxsize_kwarg
         )
-        list(result_gen)
+        results = list(result_gen)
 
     # Timing-safe, as the method under test should block until the pool shutdown is
     # complete, at which point all download stream workers have already been submitted
     # to the thread pool.
     assert download_stream.call_count == stream_count  # once for each stream
     assert queue_used.maxsize == expected_maxsize
+    assert isinstance(queue_used, module_under_test._ByteBudgetQueue) == (
+        not maxsize_kwarg
+    )
+    assert results == ["RESULT_PAGE"] * len(results)
+
+
+@pytest.mark.skipif(
+    bigquery_storage is None, reason="Requires `google-cloud-bigquery-storage`"
+)
+def test__download_table_bqstorage_decodes_first_page_alone(
+    module_under_test, monkeypatch
+):
+    from google.cloud.bigquery import dataset
+    from google.cloud.bigquery import table
+    from google.cloud.bigquery_storage_v1 import reader
+
+    arrow_schema = pyarrow.schema([("int_col", pyarrow.int64())])
+    record_batches = [
+        pyarrow.record_batch([pyarrow.array([value])], schema=arrow_schema)
+        for value in range(3)
+    ]
+    session = bigquery_storage.types.ReadSession(
+        streams=[{"name": "stream/s0"}, {"name": "stream/s1"}],
+        arrow_schema={"serialized_schema": arrow_schema.serialize().to_pybytes()},
+    )
+    messages = [
+        bigquery_storage.types.ReadRowsResponse(
+            arrow_record_batch={
+                "serialized_record_batch": record_batch.serialize().to_pybytes(),
+                "row_count": 1,
+            }
+        )
+        for record_batch in record_batches
+    ]
+
+    def read_rows(stream_name):
+        # The second stream is empty, so the pages of the first stream have
+        # the two decoding threads to themselves.
+        stream_messages = messages if stream_name == "stream/s0" else []
+        rowstream = mock.Mock()
+        rowstream.rows.return_value = reader.ReadRowsIterable(
+            iter(stream_messages), read_session=session
+        )
+        return rowstream
+
+    bqstorage_client = mock.create_autospec(
+        bigquery_storage.BigQueryReadClient, instance=True
+    )
+    bqstorage_client.create_read_session.return_value = session
+    bqstorage_client.read_rows.side_effect = read_rows
+    table_ref = table.TableReference(
+        dataset.DatasetReference("project-x", "dataset-y"), "table-z",
+    )
+
+    # Parsing the schema of the stream is not thread-safe. Slow it down, so
+    # that concurrent decodes of the pages would overlap with it.
+    parse_arrow_schema = reader._ArrowStreamParser._parse_arrow_schema
+    parsing = []
+    overlapping = []
+
+    def slow_parse_arrow_schema(stream_parser):
+        if stream_parser._schema is None:
+            if stream_parser in parsing:
+                overlapping.append(stream_parser)
+            parsing.append(stream_parser)
+            time.sleep(0.1)
+            parsing.remove(stream_parser)
+        parse_arrow_schema(stream_parser)
+
+    monkeypatch.setattr(
+        reader._ArrowStreamParser, "_parse_arrow_schema", slow_parse_arrow_schema
+    )
+
+    with mock.patch("os.cpu_count", return_value=8):
+        result_gen = module_under_test._download_table_bqstorage(
+            "some-project",
+            table_ref,
+            bqstorage_client,
+            page_to_item=module_under_test._bqstorage_page_to_arrow,
+        )
+        results = list(result_gen)
+
+    assert not overlapping
+    assert results == record_batches
+
+
+@pytest.mark.skipif(
+    not hasattr(bigquery_storage, "ArrowSerializationOptions"),
+    reason="Requires `google-cloud-bigquery-storage` with Arrow compression support",
+)
+@pytest.mark.parametrize(
+    "env_codec,codec_arg,expected_codec_name",
+    [
+        (None, None, None),  # preferred codec
+        ("lz4_frame", None, "LZ4_FRAME"),  # override via environment
+        ("lz4_frame", "COMPRESSION_UNSPECIFIED", "COMPRESSION_UNSPECIFIED"),
+    ],
+)
+def test__download_table_bqstorage_compression_codec(
+    module_under_test, monkeypatch, env_codec, codec_arg, expected_codec_name
+):
+    from google.cloud.bigquery import dataset
+    from google.cloud.bigquery import table
+
+    codecs = bigquery_storage.ArrowSerializationOptions.CompressionCodec
+    if expected_codec_name is None:
+        expected_codec = module_under_test._PREFERRED_ARROW_CODEC
+    else:
+        expected_codec = codecs[expected_codec_name]
+
+    codec_kwarg = {}
+    if codec_arg is not None:
+        codec_kwarg["compression_codec"] = codecs[codec_arg]
+
+    if env_codec is None:
+        monkeypatch.delenv(module_under_test._ARROW_CODEC_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(module_under_test._ARROW_CODEC_ENV_VAR, env_codec)
+
+    bqstorage_client = mock.create_autospec(
+        bigquery_storage.BigQueryReadClient, instance=True
+    )
+    bqstorage_client.create_read_session.return_value = mock.Mock(streams=[])
+    table_ref = table.TableReference(
+        dataset.DatasetReference("project-x", "dataset-y"), "table-z",
+    )
+
+    result_gen = module_under_test._download_table_bqstorage(
+        "some-project", table_ref, bqstorage_client, **codec_kwarg
+    )
+    assert list(result_gen) == []
+
+    read_session = bqstorage_client.create_read_session.call_args.kwargs["read_session"]
+    read_options = read_session.read_options
+    assert read_options.arrow_serialization_options.buffer_compression == expected_codec
+
+
+@pytest.mark.skipif(
+    not hasattr(bigquery_storage, "ArrowSerializationOptions"),
+    reason="Requires `google-cloud-bigquery-storage` with Arrow compression support",
+)
+def test__download_table_bqstorage_w_unknown_env_compression_codec(
+    module_under_test, monkeypatch
+):
+    from google.cloud.bigquery import dataset
+    from google.cloud.bigquery import table
+
+    monkeypatch.setenv(module_under_test._ARROW_CODEC_ENV_VAR, "NOT_A_CODEC")
+    bqstorage_client = mock.create_autospec(
+        bigquery_storage.BigQueryReadClient, instance=True
+    )
+    table_ref = table.TableReference(
+        dataset.DatasetReference("project-x", "dataset-y"), "table-z",
+    )
+
+    result_gen = module_under_test._download_table_bqstorage(
+        "some-project", table_ref, bqstorage_client
+    )
+    with pytest.raises(ValueError, match="NOT_A_CODEC"):
+        next(result_gen)
+
+    bqstorage_client.create_read_session.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "stream_count,cpu_count,expected_max_workers",
+    [(3, 8, 3), (100, 2, 8), (100, None, 4), (100, 8, 32)],
+)
+@pytest.mark.skipif(
+    bigquery_storage is None, reason="Requires `google-cloud-bigquery-storage`"
+)
+def test__download_table_bqstorage_max_workers(
+    module_under_test, stream_count, cpu_count, expected_max_workers
+):
+    from google.cloud.bigquery import dataset
+    from google.cloud.bigquery import table
+
+    bqstorage_client = mock.create_autospec(
+        bigquery_storage.BigQueryReadClient, instance=True
+    )
+    fake_session = mock.Mock(streams=["stream/s{i}" for i in range(stream_count)])
+    bqstorage_client.create_read_session.return_value = fake_session
+    table_ref = table.TableReference(
+        dataset.DatasetReference("project-x", "dataset-y"), "table-z",
+    )
+
+    download_stream = mock.Mock()
+    pool_patch = mock.patch(
+        "concurrent.futures.ThreadPoolExecutor",
+        wraps=concurrent.futures.ThreadPoolExecutor,
+    )
+    cpu_count_patch = mock.patch("os.cpu_count", return_value=cpu_count)
+    stream_patch = mock.patch.object(
+        module_under_test, "_download_table_bqstorage_stream", new=download_stream
+    )
+
+    with pool_patch as fake_pool, cpu_count_patch, stream_patch:
+        result_gen = module_under_test._download_table_bqstorage(
+            "some-project", table_ref, bqstorage_client
+        )
+        list(result_gen)
+
+    assert download_stream.call_count == stream_count
+    # The decoding pool is created first, then the download pool.
+    download_pool_call = fake_pool.call_args_list[-1]
+    assert download_pool_call.kwargs["max_workers"] == expected_max_workers
+
+
+def test__download_table_bqstorage_stream_w_download_done(module_under_test):
+    bqstorage_client = mock.Mock()
+    worker_queue = mock.Mock()
+    download_state = module_under_test._DownloadState()
+    download_state.done = True
+
+    module_under_test._download_table_bqstorage_stream(
+        download_state,
+        bqstorage_client,
+        mock.sentinel.session,
+        mock.Mock(name="stream/s0"),
+        worker_queue,
+        mock.Mock(),
+    )
+
+    bqstorage_client.read_rows.assert_not_called()
+    worker_queue.put.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "env_budget,total_streams,expected_budget",
+    [(None, 1, 64 * 1024 * 1024), (None, 20, 160 * 1024 * 1024), ("1000", 20, 1000)],
+)
+def test__get_download_memory_budget(
+    module_under_test, monkeypatch, env_budget, total_streams, expected_budget
+):
+    if env_budget is None:
+        monkeypatch.delenv(module_under_test._MEMORY_BUDGET_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(module_under_test._MEMORY_BUDGET_ENV_VAR, env_budget)
+
+    budget = module_under_test._get_download_memory_budget(total_streams)
+
+    assert budget == expected_budget
+
+
+def test__get_download_memory_budget_invalid(module_under_test, monkeypatch):
+    monkeypatch.setenv(module_under_test._MEMORY_BUDGET_ENV_VAR, "lots")
+
+    with pytest.raises(ValueError, match="lots"):
+        module_under_test._get_download_memory_budget(1)
+
+
+def _make_frame_future(nbytes=None):
+    future = concurrent.futures.Future()
+    if nbytes is not None:
+        future.set_result(mock.Mock(nbytes=nbytes))
+    return future
+
+
+def test__byte_budget_queue_blocks_when_budget_exceeded(module_under_test):
+    worker_queue = module_under_test._ByteBudgetQueue(max_bytes=100, max_pending=10)
+
+    worker_queue.put(_make_frame_future(60))
+    worker_queue.put(_make_frame_future(60))
+
+    # Budget exceeded by the frames still in the queue.
+    with pytest.raises(queue.Full):
+        worker_queue.put_nowait(_make_frame_future(1))
+    with pytest.raises(queue.Full):
+        worker_queue.put(_make_frame_future(1), timeout=0.01)
+
+    # Taking a frame from the queue releases its part of the budget.
+    assert worker_queue.get_nowait().result().nbytes == 60
+    worker_queue.put_nowait(_make_frame_future(1))
+    assert worker_queue.qsize() == 2
+
+
+def test__byte_budget_queue_blocks_when_too_many_pending(module_under_test):
+    worker_queue = module_under_test._ByteBudgetQueue(max_bytes=100, max_pending=1)
+    pending = _make_frame_future()
+
+    worker_queue.put(pending)
+    with pytest.raises(queue.Full):
+        worker_queue.put_nowait(_make_frame_future(1))
+
+    # Decoding the frame frees the pending slot, and counts its size.
+    pending.set_result(mock.Mock(nbytes=10))
+    worker_queue.put_nowait(_make_frame_future(1))
+
+    # Frames are released even if taken before they are decoded.
+    another_pending = _make_frame_future()
+    worker_queue.get_nowait()
+    worker_queue.get_nowait()
+    worker_queue.put_nowait(another_pending)
+    assert worker_queue.get_nowait() is another_pending
+    another_pending.set_result(mock.Mock(nbytes=90))
+    worker_queue.put_nowait(_make_frame_future(200))
+
+    assert worker_queue.qsize() == 1
+
+
+def test__byte_budget_queue_consumed_before_decoded_callback(module_under_test):
+    worker_queue = module_under_test._ByteBudgetQueue(max_bytes=100, max_pending=10)
+    frame_future = _make_frame_future()
+    decoded_callbacks = []
+
+    # Delay the decoded callback, as if the future had finished but its
+    # callbacks were still running when the main thread took the item.
+    with mock.patch.object(
+        frame_future, "add_done_callback", side_effect=decoded_callbacks.append
+    ):
+        worker_queue.put(frame_future)
+    frame_future.set_result(mock.Mock(nbytes=100))
+
+    assert worker_queue.get_nowait() is frame_future
+    (on_frame_decoded,) = decoded_callbacks
+    on_frame_decoded(frame_future)
+
+    # The frame was consumed, so its size must not use up the budget.
+    worker_queue.put_nowait(_make_frame_future(1))
+    assert worker_queue.qsize() == 1
+
+
+def test__byte_budget_queue_close_unblocks_producers(module_under_test):
+    worker_queue = module_under_test._ByteBudgetQueue(max_bytes=1, max_pending=1)
+    worker_queue.put_nowait(_make_frame_future(10))
+
+    worker_queue.close()
+    worker_queue.put_nowait(_make_frame_future(10))
+
+    assert worker_queue.qsize() == 2
+
+
+@pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
+def test__frame_nbytes_w_dataframe(module_under_test):
+    dataframe = pandas.DataFrame({"int_col": [1, 2, 3]}, dtype="int64")
+    assert module_under_test._frame_nbytes(dataframe) == 24
 
 
 @pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
@@ -1467,3 +1996,97 @@ def test_download_dataframe_row_iterator_dict_sequence_schema(module_under_test)
 def test_table_data_listpage_to_dataframe_skips_stop_iteration(module_under_test):
     dataframe = module_under_test._row_iterator_page_to_dataframe([], [], {})
     assert isinstance(dataframe, pandas.DataFrame)
+
+
+@pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
+def test_dataframe_to_json_generator(module_under_test):
+    dataframe = pandas.DataFrame(
+        {
+            "str_col": ["abc", float("NaN"), None],
+            "int_col": [1, 2, 3],
+            "float_col": [float("NaN"), 0.25, 0.5],
+            "ts_col": [
+                datetime.datetime(2021, 1, 2, 3, 4, 5),
+                pandas.NaT,
+                datetime.datetime(2021, 6, 7, 8, 9, 10),
+            ],
+        }
+    )
+
+    rows = list(module_under_test.dataframe_to_json_generator(dataframe))
+
+    assert rows == [
+        {
+            "str_col": "abc",
+            "int_col": 1,
+            "ts_col": pandas.Timestamp(2021, 1, 2, 3, 4, 5),
+        },
+        {"int_col": 2, "float_col": 0.25},
+        {
+            "int_col": 3,
+            "float_col": 0.5,
+            "ts_col": pandas.Timestamp(2021, 6, 7, 8, 9, 10),
+        },
+    ]
+    assert type(rows[0]["int_col"]) is int
+
+    # An index without columns has no rows to insert.
+    no_columns = pandas.DataFrame(index=[0, 1, 2])
+    assert list(module_under_test.dataframe_to_json_generator(no_columns)) == []
+
+
+@pytest.mark.skipif(pandas is None, reason="Requires `pandas`")
+def test_row_iterator_page_to_dataframe_w_dtypes(module_under_test):
+    fake_page = api_core.page_iterator.Page(
+        parent=mock.Mock(),
+        items=[{"page_data": "foo"}],
+        item_to_value=api_core.page_iterator._item_to_value_identity,
+    )
+    # Like the real pages, the columns are generators rather than lists.
+    fake_page._columns = [
+        (value for value in column)
+        for column in ([1, None, 100], [1, 2, 3], ["a", "b", "c"])
+    ]
+
+    dataframe = module_under_test._row_iterator_page_to_dataframe(
+        fake_page, ["int_col", "float_col", "str_col"], {"float_col": "float32"}
+    )
+
+    assert list(dataframe.columns) == ["int_col", "float_col", "str_col"]
+    assert dataframe["int_col"].dtype.name == "float64"
+    assert dataframe["float_col"].dtype.name == "float32"
+    assert dataframe["str_col"].dtype.name == "object"
+    assert dataframe["float_col"].tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.skipif(isinstance(pyarrow, mock.Mock), reason="Requires `pyarrow`")
+def test_download_arrow_row_iterator_shares_schema(module_under_test):
+    pages = []
+    for columns in ([[1, 2], ["a", "b"]], [[3], ["c"]]):
+        fake_page = api_core.page_iterator.Page(
+            parent=mock.Mock(),
+            items=[{"page_data": "foo"}],
+            item_to_value=api_core.page_iterator._item_to_value_identity,
+        )
+        fake_page._columns = columns
+        pages.append(fake_page)
+
+    bq_schema = [
+        schema.SchemaField("int_col", "INTEGER"),
+        schema.SchemaField("str_col", "STRING"),
+    ]
+
+    record_batch_patch = mock.patch("pyarrow.RecordBatch", wraps=pyarrow.RecordBatch)
+    with record_batch_patch as fake_record_batch:
+        results = list(module_under_test.download_arrow_row_iterator(pages, bq_schema))
+
+    # Every batch is built with the very same schema object.
+    from_arrays_calls = fake_record_batch.from_arrays.call_args_list
+    assert len(from_arrays_calls) == 2
+    schemas = [call.kwargs["schema"] for call in from_arrays_calls]
+    assert schemas[0] is schemas[1]
+    assert len(results) == 2
+    assert pyarrow.Table.from_batches(results).to_pydict() == {
+        "int_col": [1, 2, 3],
+        "str_col": ["a", "b", "c"],
+    }